@@ -0,0 +1,24 @@
+import re
+import os
+import streamlit as st
+
+from novel_to_epub import scrape_and_build_epub
+
+
+st.title("Webnovel ePub Downloader")
+link = st.text_input("First chapter URL (…_2.html):")
+if st.button("Download ePub"):
+    if not link:
+        st.error("Enter a valid URL ending in _n.html.")
+    else:
+        m = re.match(r"(.+)_([0-9]+)\.html", link)
+        if not m:
+            st.error("URL must end with _<number>.html")
+        else:
+            base, num = m.group(1), int(m.group(2))
+            with st.spinner("Working… this may take some minutes"):
+                epub_file, title = scrape_and_build_epub(base, start_page=num)
+            with open(epub_file, 'rb') as ef:
+                data = ef.read()
+            st.success(f"Done: {title}")
+            st.download_button("Download ePub", data=data, file_name=os.path.basename(epub_file), mime="application/epub+zip")
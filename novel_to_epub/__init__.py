@@ -0,0 +1,40 @@
+"""Webnovel scraping, translation and EPUB assembly."""
+import asyncio
+import os
+from deep_translator import GoogleTranslator
+
+from .scrape import _load_checkpoint, _run_pipeline, clean_text, sanitize_filename
+from .translate import translate_batched
+from .epub_build import build_epub
+
+__all__ = [
+    'scrape_and_build_epub',
+    'sanitize_filename',
+    'clean_text',
+    'translate_batched',
+    'build_epub',
+]
+
+
+def scrape_and_build_epub(base_url: str, start_page: int):
+    # temp storage for the finished ePub
+    os.makedirs('temp_output', exist_ok=True)
+    translator = GoogleTranslator(source='auto', target='en')
+
+    # resume support: pages already translated by a crashed run are skipped
+    ckpt_path = os.path.join(
+        'temp_output', sanitize_filename(base_url.rstrip('/').split('/')[-1]) + '.ckpt.jsonl')
+    done = _load_checkpoint(ckpt_path)
+
+    novel_title, translated = asyncio.run(
+        _run_pipeline(base_url, start_page, translator, done, ckpt_path))
+    chapters = [translated[page] for page in sorted(translated)]
+
+    if novel_title is None:
+        novel_title = base_url.rstrip('/').split('/')[-1]
+
+    epub_path = build_epub(novel_title, chapters)
+    # the run completed, so the checkpoint has served its purpose
+    if os.path.exists(ckpt_path):
+        os.remove(ckpt_path)
+    return epub_path, novel_title
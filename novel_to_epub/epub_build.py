@@ -0,0 +1,44 @@
+import html
+import io
+import os
+from ebooklib import epub
+
+from .scrape import sanitize_filename
+
+
+def build_epub(novel_title: str, chapters, out_dir: str = 'temp_output') -> str:
+    """Assemble an EPUB from in-memory chapter texts; returns the .epub path."""
+    book = epub.EpubBook()
+    book.set_identifier('id1')
+    book.set_title(novel_title)
+    book.set_language('en')
+
+    # one EpubHtml per chapter so readers can lazy-load instead of laying
+    # out the whole novel as a single monolithic document
+    items = []
+    for i, chapter in enumerate(chapters, start=1):
+        paras = [p for p in chapter.split('\n\n') if p.strip()]
+        # write the XHTML straight into a bytes buffer: handing ebooklib
+        # bytes skips a second encode, and escaping keeps stray < and &
+        # from corrupting it
+        buf = io.BytesIO()
+        buf.write(b'<html xmlns="http://www.w3.org/1999/xhtml"><body>')
+        for p in paras:
+            buf.write(b'<p>')
+            buf.write(html.escape(p).encode('utf-8'))
+            buf.write(b'</p>')
+        buf.write(b'</body></html>')
+
+        item = epub.EpubHtml(title=f'Chapter {i}', file_name=f'ch{i:04}.xhtml', lang='en')
+        item.content = buf.getvalue()
+        book.add_item(item)
+        items.append(item)
+
+    book.toc = tuple(items)
+    book.spine = ['nav'] + items
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+
+    epub_path = os.path.join(out_dir, sanitize_filename(novel_title) + '.epub')
+    epub.write_epub(epub_path, book)
+    return epub_path
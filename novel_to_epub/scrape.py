@@ -0,0 +1,259 @@
+import asyncio
+import json
+import re
+import os
+import time
+import aiohttp
+from aiolimiter import AsyncLimiter
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
+
+from .translate import TRANSLATE_WORKERS, translate_batched
+
+
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+CONCURRENCY = 16
+REQUESTS_PER_SEC = 10
+QUEUE_SIZE = 64
+
+# compiled once: this runs on every chapter, and re's internal cache can
+# get evicted under churn from other patterns
+_SANITIZE_RE = re.compile(r'[\\/:*?"<>|]')
+
+
+def sanitize_filename(name: str) -> str:
+    return _SANITIZE_RE.sub('_', name)
+
+
+def clean_text(text: str) -> str:
+    # Trim spaces and collapse blank lines in one pass over the text:
+    # strip each line, drop empties, put one blank line between the rest
+    return '\n\n'.join(
+        stripped for line in text.split('\n') if (stripped := line.strip()))
+
+
+class RateLimiter:
+    """
+    Leaky-bucket request pacing built on aiolimiter, with a pause-and-tighten
+    hook for Retry-After responses.
+    """
+    def __init__(self, rate: float):
+        self._limiter = AsyncLimiter(rate, 1)
+        self._pause_until = 0.0
+
+    async def acquire(self):
+        delay = self._pause_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self._limiter.acquire()
+
+    def backoff(self, retry_after):
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = 1.0
+        self._pause_until = time.monotonic() + delay
+        # the server is pushing back, so also halve the sustained rate;
+        # aiolimiter caches its leak rate at construction (mutating
+        # max_rate only shrinks burst capacity), so swap in a new limiter
+        self._limiter = AsyncLimiter(max(1.0, self._limiter.max_rate / 2), 1)
+
+
+async def fetch_chapter(session, url: str, sem: asyncio.BoundedSemaphore, bucket: RateLimiter,
+                        attempts: int = 3):
+    """
+    Fetch one chapter page; returns (status, html_text) with text=None on 404
+    or once retries are exhausted. 429s and 5xx responses are retried after
+    the backoff window rather than returned as if they were chapter HTML.
+    """
+    status = None
+    for attempt in range(attempts):
+        async with sem:
+            await bucket.acquire()
+            async with session.get(url) as resp:
+                status = resp.status
+                if status == 404:
+                    return 404, None
+                if status == 429:
+                    bucket.backoff(resp.headers.get('Retry-After'))
+                elif status < 500:
+                    return status, await resp.text()
+        if attempt < attempts - 1:
+            # transient failure: the limiter already pauses for Retry-After,
+            # this spaces out plain 5xx retries
+            await asyncio.sleep(2 ** attempt)
+    return status, None
+
+
+async def _page_exists(session, base_url: str, page: int, sem, bucket) -> bool:
+    async with sem:
+        await bucket.acquire()
+        async with session.head(f"{base_url}_{page}.html") as resp:
+            return resp.status != 404
+
+
+async def find_last_page(session, base_url: str, start_page: int, sem, bucket) -> int:
+    """
+    Locate the last existing chapter page in O(log N) HEAD requests: double
+    the probe distance until a page is missing, then bisect the gap between
+    the last hit and the first miss. Returns start_page - 1 if even the
+    first page is missing.
+    """
+    if not await _page_exists(session, base_url, start_page, sem, bucket):
+        return start_page - 1
+    good = start_page
+    span = 1
+    while await _page_exists(session, base_url, good + span, sem, bucket):
+        good += span
+        span *= 2
+    lo, hi = good, good + span
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if await _page_exists(session, base_url, mid, sem, bucket):
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _load_checkpoint(path: str) -> dict:
+    """Read an append-only JSONL checkpoint back into {page: translated_text}."""
+    done = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # torn write from a crashed run
+                done[row['page']] = row['text']
+    return done
+
+
+def _extract_chapter(html_text: str):
+    """
+    Pull (title, paragraphs) out of a chapter page with selectolax (C-backed,
+    much faster than html.parser); fall back to BeautifulSoup only when the
+    fast parse finds nothing.
+    """
+    tree = HTMLParser(html_text)
+    title = None
+    paras = []
+    # one combined query walks the tree once for both title and paragraphs
+    for node in tree.css('.article-title, .article-content p'):
+        text = node.text(strip=True)
+        if not text:
+            continue
+        if title is None and 'article-title' in (node.attributes.get('class') or ''):
+            title = text
+        else:
+            paras.append(text)
+    if not paras:
+        node = tree.css_first('.article-content')
+        if node:
+            raw = node.text(separator='\n')
+            paras = [p for p in clean_text(raw).split('\n\n') if p.strip()]
+    if title is not None or paras:
+        return title, paras
+
+    soup = BeautifulSoup(html_text, 'html.parser')
+    tag = soup.find(class_='article-title')
+    title = tag.get_text(strip=True) if tag else None
+    paras = []
+    content_div = soup.find(class_='article-content')
+    if content_div:
+        # bind the stripped text once instead of descending the tree twice
+        paras = [t for p in content_div.find_all('p') if (t := p.get_text(strip=True))]
+        if not paras:
+            raw = content_div.get_text(separator='\n')
+            paras = [p for p in clean_text(raw).split('\n\n') if p.strip()]
+    return title, paras
+
+
+async def _run_pipeline(base_url: str, start_page: int, translator, done: dict, ckpt_path: str):
+    """
+    Two-stage producer/consumer pipeline: scrape coroutines push (page, html)
+    into a bounded queue while translate workers pull, parse and translate
+    concurrently, so neither phase waits for the other to drain. A writer
+    task flushes results to the checkpoint in page order. Returns
+    (first_title, {page: english}) including previously checkpointed pages.
+    """
+    sem = asyncio.BoundedSemaphore(CONCURRENCY)
+    bucket = RateLimiter(REQUESTS_PER_SEC)
+    connector = aiohttp.TCPConnector(limit_per_host=16)
+    scrape_q = asyncio.Queue(maxsize=QUEUE_SIZE)
+    translated_q = asyncio.Queue(maxsize=QUEUE_SIZE)
+    titles = {}
+    translated = dict(done)
+    loop = asyncio.get_running_loop()
+
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session:
+        last = await find_last_page(session, base_url, start_page, sem, bucket)
+        if last < start_page:
+            return None, translated
+        wanted = [p for p in range(start_page, last + 1) if p not in done]
+
+        async def produce(page):
+            _, text = await fetch_chapter(session, f"{base_url}_{page}.html", sem, bucket)
+            # push even misses so the writer can account for every page
+            await scrape_q.put((page, text))
+
+        async def translate_worker(executor):
+            while True:
+                item = await scrape_q.get()
+                if item is None:
+                    return
+                page, html_text = item
+                english = None
+                if html_text is not None:
+                    title, paras = _extract_chapter(html_text)
+                    if title and page not in titles:
+                        titles[page] = title
+                    if paras:
+                        english = await loop.run_in_executor(
+                            executor, translate_batched, paras, translator)
+                await translated_q.put((page, english))
+
+        async def writer():
+            # flush in page order: hold results back until every earlier
+            # page has arrived, then checkpoint the contiguous run; one
+            # handle held open for the whole run instead of an open/close
+            # per chapter, flushed per page so a crash can still resume
+            holdback = {}
+            idx = 0
+            with open(ckpt_path, 'a', encoding='utf-8') as f:
+                while idx < len(wanted):
+                    page, english = await translated_q.get()
+                    holdback[page] = english
+                    while idx < len(wanted) and wanted[idx] in holdback:
+                        flushed = holdback.pop(wanted[idx])
+                        if flushed is not None:
+                            translated[wanted[idx]] = flushed
+                            f.write(json.dumps(
+                                {'page': wanted[idx], 'text': flushed}, ensure_ascii=False) + '\n')
+                            f.flush()
+                        idx += 1
+
+        async def produce_all():
+            await asyncio.gather(*(produce(p) for p in wanted))
+            for _ in range(TRANSLATE_WORKERS):
+                await scrape_q.put(None)
+
+        with ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS) as executor:
+            stages = [asyncio.create_task(produce_all()),
+                      *(asyncio.create_task(translate_worker(executor))
+                        for _ in range(TRANSLATE_WORKERS)),
+                      asyncio.create_task(writer())]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                # a dead stage leaves its peers blocked on the bounded
+                # queues forever; cancel them all and surface the error
+                for task in stages:
+                    task.cancel()
+                await asyncio.gather(*stages, return_exceptions=True)
+                raise
+
+    first_title = titles[min(titles)] if titles else None
+    return first_title, translated
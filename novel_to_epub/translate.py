@@ -0,0 +1,197 @@
+import atexit
+import hashlib
+import os
+import shelve
+import threading
+import time
+
+
+# delimiter unlikely to survive mangled through translation
+_SENTINEL = '\n\n◊§◊\n\n'
+SEGMENT_LIMIT = 4800
+SEGMENTS_PER_REQUEST = 100
+TRANSLATE_WORKERS = 8
+
+
+# persistent translation cache: webnovels repeat boilerplate paragraphs
+# (headers, author notes, ads) across chapters, so exact-match hits skip
+# API calls; entries carry a last-used timestamp for LRU-style eviction
+_translate_cache = None
+_cache_lock = threading.Lock()
+CACHE_MAX_ENTRIES = 10000
+
+
+def _get_translate_cache():
+    global _translate_cache
+    if _translate_cache is None:
+        # double-checked under the lock: the first wave of worker threads
+        # arrives here together, and two shelve.open calls on the same dbm
+        # file can error or corrupt it
+        with _cache_lock:
+            if _translate_cache is None:
+                os.makedirs('temp_output', exist_ok=True)
+                _translate_cache = shelve.open(os.path.join('temp_output', 'translate_cache'))
+                atexit.register(_translate_cache.close)
+    return _translate_cache
+
+
+def _paragraph_key(paragraph: str) -> str:
+    return hashlib.blake2b(paragraph.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _evict_stale(cache):
+    """Keep the store bounded: drop the least recently used entries once the
+    cap is exceeded. Caller holds _cache_lock."""
+    overflow = len(cache) - CACHE_MAX_ENTRIES
+    if overflow <= 0:
+        return
+    stalest = sorted(
+        cache.items(),
+        key=lambda kv: kv[1].get('ts', 0) if isinstance(kv[1], dict) else 0)
+    for key, _ in stalest[:overflow]:
+        del cache[key]
+    cache.sync()
+
+
+_thread_local = threading.local()
+
+
+def _thread_translator(translator):
+    """
+    deep-translator mutates shared request state (the query params) on every
+    translate call, so concurrent workers using one instance can swap payloads
+    mid-flight. Give each worker thread its own clone of the configured
+    translator instead.
+    """
+    local = getattr(_thread_local, 'translator', None)
+    if local is None:
+        local = type(translator)(source=translator.source, target=translator.target)
+        _thread_local.translator = local
+    return local
+
+
+def _translate_with_retry(translator, segments, attempts=3):
+    """Retry transient translate failures (rate limits, dropped connections)
+    with exponential back-off; the last attempt propagates."""
+    delay = 1.0
+    for _ in range(attempts - 1):
+        try:
+            return translator.translate_batch(segments)
+        except Exception:
+            time.sleep(delay)
+            delay *= 2
+    return translator.translate_batch(segments)
+
+
+def translate_batched(paragraphs, translator) -> str:
+    """
+    Translate paragraphs with per-paragraph caching: repeated paragraphs are
+    served from the store, and only the misses are greedily packed into
+    sub-4800-char sentinel-joined segments sent out 100 per translate_batch
+    call, then split back apart and reassembled.
+    """
+    translator = _thread_translator(translator)
+    paras = [piece for p in paragraphs if (piece := p.strip())]
+
+    # serve repeats from the cache; only misses go out over the network.
+    # Keys are paragraph hashes, so boilerplate repeated across chapters
+    # hits regardless of how the surrounding text packs into segments.
+    cache = _get_translate_cache()
+    translated = [None] * len(paras)
+    misses = []
+    now = time.time()
+    with _cache_lock:
+        for i, piece in enumerate(paras):
+            entry = cache.get(_paragraph_key(piece))
+            if isinstance(entry, dict):
+                translated[i] = entry['text']
+                # refresh recency so hot boilerplate survives eviction
+                cache[_paragraph_key(piece)] = {'text': entry['text'], 'ts': now}
+            else:
+                misses.append(i)
+
+    # pack missing paragraphs; groups[j] lists which paragraphs make up
+    # segment j, so responses can be attributed back after the sentinel split
+    segments, groups = [], []
+    buffer, group = '', []
+    for i in misses:
+        piece = paras[i]
+        if len(piece) > SEGMENT_LIMIT:
+            # a lone oversized paragraph would be rejected whole by the
+            # API's per-request character cap; hard-split it into
+            # limit-sized segments of its own
+            if buffer:
+                segments.append(buffer)
+                groups.append(group)
+                buffer, group = '', []
+            for j in range(0, len(piece), SEGMENT_LIMIT):
+                segments.append(piece[j:j + SEGMENT_LIMIT])
+                groups.append([i])
+            continue
+        joined = buffer + _SENTINEL + piece if buffer else piece
+        if len(joined) <= SEGMENT_LIMIT:
+            buffer = joined
+            group.append(i)
+        else:
+            if buffer:
+                segments.append(buffer)
+                groups.append(group)
+            buffer, group = piece, [i]
+    if buffer:
+        segments.append(buffer)
+        groups.append(group)
+
+    para_parts = {}
+    failed = set()
+    uncacheable = set()
+    for start in range(0, len(segments), SEGMENTS_PER_REQUEST):
+        stop = min(start + SEGMENTS_PER_REQUEST, len(segments))
+        sub = segments[start:stop]
+        try:
+            out = _translate_with_retry(translator, sub)
+        except Exception:
+            # translate_batch is all-or-nothing, so one bad segment must not
+            # drop the whole sub-batch: retry each segment on its own and
+            # keep whatever succeeds
+            out = []
+            for seg in sub:
+                try:
+                    out.extend(translator.translate_batch([seg]))
+                except Exception:
+                    out.append(None)
+        for j, seg_out in zip(range(start, stop), out):
+            seg_group = groups[j]
+            if seg_out is None:
+                failed.update(seg_group)
+                continue
+            # split on the bare sentinel core: translation may eat the newlines
+            parts = [s.strip() for s in seg_out.split('◊§◊') if s.strip()]
+            if len(seg_group) == 1:
+                para_parts.setdefault(seg_group[0], []).append(' '.join(parts))
+            elif len(parts) == len(seg_group):
+                for i, part in zip(seg_group, parts):
+                    para_parts.setdefault(i, []).append(part)
+            else:
+                # sentinel got mangled: keep the text, but the per-paragraph
+                # attribution is unreliable so don't cache any of the group
+                para_parts.setdefault(seg_group[0], []).append('\n\n'.join(parts))
+                uncacheable.update(seg_group)
+                for i in seg_group[1:]:
+                    para_parts.setdefault(i, [])
+
+    now = time.time()
+    with _cache_lock:
+        for i in misses:
+            parts_list = para_parts.get(i)
+            if i in failed or parts_list is None:
+                # keep the original text, but don't cache the failure
+                translated[i] = paras[i]
+                continue
+            text = ' '.join(parts_list)
+            translated[i] = text
+            if text and i not in uncacheable:
+                cache[_paragraph_key(paras[i])] = {'text': text, 'ts': now}
+        cache.sync()
+        _evict_stale(cache)
+
+    return '\n\n'.join(t for t in translated if t)